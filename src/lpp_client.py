@@ -3,102 +3,190 @@
 LPP Client - Client library for communicating with lpp_daemon.
 """
 
+import asyncio
 import json
 import os
-import socket
+import stat
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator
+
+# Socket protocol codec, also used by lpp_daemon: one JSON object per
+# newline-terminated line. Uses orjson when installed, stdlib json otherwise.
+try:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        """Encode a protocol message (without the trailing newline)."""
+        return orjson.dumps(obj)
+
+    loads = orjson.loads
+except ImportError:
+    def dumps(obj: Any) -> bytes:
+        """Encode a protocol message (without the trailing newline)."""
+        return json.dumps(obj).encode()
+
+    loads = json.loads
 
 
 # Socket path in XDG runtime directory
 SOCKET_PATH = Path(os.environ.get('XDG_RUNTIME_DIR', f'/run/user/{os.getuid()}')) / 'lpp.sock'
 
+# Seconds to wait for a daemon response
+REQUEST_TIMEOUT = 5.0
+
+# Background reconnect after the connection breaks (delay grows per attempt)
+RECONNECT_DELAY = 0.5
+MAX_RECONNECT_ATTEMPTS = 5
+
 
 class LPPClient:
     """Client for communicating with the LPP daemon."""
 
     def __init__(self, socket_path: Path | str | None = None):
         self.socket_path = Path(socket_path) if socket_path else SOCKET_PATH
-        self.sock: socket.socket | None = None
-
-    def connect(self) -> bool:
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+        # One request/response in flight at a time on the shared stream
+        self._lock = asyncio.Lock()
+        self._connect_lock = asyncio.Lock()
+        # Replies still owed for requests that timed out; skipped when they arrive
+        self._stale_replies = 0
+        self._reconnect_attempts = 0
+        self._reconnect_task: asyncio.Task | None = None
+
+    async def connect(self) -> bool:
         """Connect to the daemon socket."""
-        if self.sock:
-            return True
-        try:
-            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            self.sock.connect(str(self.socket_path))
-            self.sock.settimeout(5.0)
-            return True
-        except (socket.error, FileNotFoundError) as e:
-            self.sock = None
-            return False
+        async with self._connect_lock:
+            if self.writer:
+                return True
+            try:
+                self.reader, self.writer = await asyncio.open_unix_connection(str(self.socket_path))
+                self._reconnect_attempts = 0
+                return True
+            except OSError:
+                self.reader, self.writer = None, None
+                return False
 
     def disconnect(self):
         """Disconnect from the daemon."""
-        if self.sock:
+        if self.writer:
             try:
-                self.sock.close()
+                self.writer.close()
             except Exception:
                 pass
-            self.sock = None
+        self.reader, self.writer = None, None
+        self._stale_replies = 0
+
+    def _schedule_reconnect(self):
+        """Reconnect in the background after the connection broke."""
+        if self._reconnect_task and not self._reconnect_task.done():
+            return
+
+        async def reconnect():
+            while not self.writer and self._reconnect_attempts < MAX_RECONNECT_ATTEMPTS:
+                self._reconnect_attempts += 1
+                await asyncio.sleep(RECONNECT_DELAY * self._reconnect_attempts)
+                if await self.connect():
+                    break
 
-    def _send_request(self, request: dict) -> dict:
+        self._reconnect_task = asyncio.create_task(reconnect())
+
+    async def _read_reply(self) -> bytes:
+        """Read the reply to the current request."""
+        while True:
+            line = await self.reader.readline()
+            if line and self._stale_replies:
+                self._stale_replies -= 1
+                continue
+            return line
+
+    async def _send_request(self, request: dict) -> dict:
         """Send a request and receive response."""
-        if not self.sock:
-            return {"ok": False, "error": "Not connected to daemon"}
+        async with self._lock:
+            if not self.writer:
+                return {"ok": False, "error": "Not connected to daemon"}
 
-        try:
-            msg = json.dumps(request) + '\n'
-            self.sock.sendall(msg.encode())
+            try:
+                self.writer.write(dumps(request) + b'\n')
+                await self.writer.drain()
 
-            response = b''
-            while True:
-                chunk = self.sock.recv(4096)
-                if not chunk:
+                response = await asyncio.wait_for(self._read_reply(), timeout=REQUEST_TIMEOUT)
+                if not response:
                     raise ConnectionError("Daemon closed connection")
-                response += chunk
-                if b'\n' in response:
-                    break
 
-            return json.loads(response.decode().strip())
-        except (socket.error, json.JSONDecodeError, ConnectionError) as e:
-            self.disconnect()
-            return {"ok": False, "error": str(e)}
-
-    def get_status(self) -> dict:
+                return loads(response)
+            except asyncio.TimeoutError:
+                # Keep the connection; the late reply is discarded when it arrives
+                self._stale_replies += 1
+                return {"ok": False, "error": "Daemon timed out"}
+            except ConnectionError as e:
+                # Broken pipe, reset or EOF: the connection is gone
+                self.disconnect()
+                self._schedule_reconnect()
+                return {"ok": False, "error": str(e)}
+            except (OSError, json.JSONDecodeError) as e:
+                return {"ok": False, "error": str(e)}
+
+    async def get_status(self) -> dict:
         """Get current status from daemon."""
-        return self._send_request({"cmd": "status"})
+        return await self._send_request({"cmd": "status"})
 
-    def set_fan(self, speed: int) -> dict:
+    async def set_fan(self, speed: int) -> dict:
         """Set fan speed (0-100)."""
-        return self._send_request({"cmd": "fan", "value": speed})
+        return await self._send_request({"cmd": "fan", "value": speed})
 
-    def set_pump(self, mode: int) -> dict:
+    async def set_pump(self, mode: int) -> dict:
         """Set pump mode (0=High, 1=Max, 2=Low, 3=Medium)."""
-        return self._send_request({"cmd": "pump", "value": mode})
+        return await self._send_request({"cmd": "pump", "value": mode})
 
-    def reconnect_ble(self) -> dict:
+    async def reconnect_ble(self) -> dict:
         """Request daemon to reconnect to BLE device."""
-        return self._send_request({"cmd": "reconnect"})
+        return await self._send_request({"cmd": "reconnect"})
+
+    async def subscribe(self) -> AsyncIterator[dict]:
+        """Subscribe to status updates pushed by the daemon.
+
+        Yields the current status, then one status event per change until the
+        daemon goes away. The connection is dedicated to events afterwards, so
+        use a separate client for requests.
+        """
+        if not self.writer:
+            return
+        try:
+            self.writer.write(dumps({"cmd": "subscribe"}) + b'\n')
+            await self.writer.drain()
+            while line := await self.reader.readline():
+                yield loads(line)
+        except (OSError, json.JSONDecodeError):
+            pass
+        finally:
+            self.disconnect()
 
     @property
     def is_connected(self) -> bool:
         """Check if connected to daemon."""
-        return self.sock is not None
+        return self.writer is not None
 
-    def __enter__(self):
-        self.connect()
+    async def __aenter__(self):
+        await self.connect()
         return self
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
         self.disconnect()
 
 
-def daemon_running() -> bool:
+async def daemon_running() -> bool:
     """Check if the daemon is running."""
-    with LPPClient() as client:
+    # Cheap checks first: no socket, or one we don't own, means no daemon of ours
+    try:
+        st = SOCKET_PATH.stat()
+    except OSError:
+        return False
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        return False
+
+    async with LPPClient() as client:
         if not client.is_connected:
             return False
-        result = client.get_status()
+        result = await client.get_status()
         return result.get("ok", False)
@@ -8,10 +8,18 @@ import asyncio
 import json
 import logging
 import os
+import random
 import signal
+import socket
+import struct
 import sys
+import threading
+import time
 from pathlib import Path
 from bleak import BleakClient, BleakScanner
+from bleak.exc import BleakError
+
+from lpp_client import dumps, loads
 
 # Configure logging for systemd journal
 logging.basicConfig(
@@ -29,6 +37,18 @@ DEVICE_NAME = "CoolingSystem"
 NUS_TX_CHAR_UUID = "6e400002-b5a3-f393-e0a9-e50e24dcca9e"  # Write
 NUS_RX_CHAR_UUID = "6e400003-b5a3-f393-e0a9-e50e24dcca9e"  # Notify
 
+# Prebuilt command frames, indexed by fan speed (0-100) / pump mode (0-3)
+FAN_CMDS = tuple(bytes([0xfe, 0x1b, 0x01, speed, 0x00, 0x00, 0x00, 0xef]) for speed in range(101))
+PUMP_CMDS = tuple(bytes([0xfe, 0x1c, 0x01, 0x3c, mode, 0x00, 0x00, 0xef]) for mode in range(4))
+SYNC_CMD = bytes([0xfe, 0x33, 0x00, 0x00, 0x00, 0x00, 0x00, 0xef])
+INIT_CMDS = (
+    PUMP_CMDS[3],
+    FAN_CMDS[0x3c],
+    bytes([0xfe, 0x1e, 0x01, 0x00, 0xb8, 0xff, 0x00, 0xef]),
+    SYNC_CMD,
+    b"sw",
+)
+
 # Socket path in XDG runtime directory
 SOCKET_PATH = Path(os.environ.get('XDG_RUNTIME_DIR', f'/run/user/{os.getuid()}')) / 'lpp.sock'
 
@@ -38,6 +58,28 @@ STATE_PATH = Path(os.environ.get('XDG_CONFIG_HOME', Path.home() / '.config')) /
 # Reconnection settings
 RECONNECT_MIN_DELAY = 1.0
 RECONNECT_MAX_DELAY = 60.0
+# Stop retrying after this many attempts or seconds (until a manual reconnect)
+RECONNECT_MAX_ATTEMPTS = 20
+RECONNECT_MAX_ELAPSED = 30 * 60
+
+# Seconds before a hung BLE write is treated as a lost connection
+BLE_WRITE_TIMEOUT = 2.0
+
+# Seconds to coalesce state changes before writing the state file
+STATE_FLUSH_DELAY = 0.5
+
+# Keepalive only runs while a client is connected or was recently active
+KEEPALIVE_INTERVAL = 60.0
+KEEPALIVE_IDLE_TIMEOUT = 300.0
+
+# Pause between init commands, roughly one BLE connection interval
+INIT_CMD_GAP = 0.02
+
+# Longest request line accepted from a client, including the newline
+MAX_REQUEST_SIZE = 4096
+
+# Drop status subscribers whose unread output grows past this many bytes
+SUBSCRIBER_MAX_BUFFER = 64 * 1024
 
 
 class LPPDaemon:
@@ -47,18 +89,34 @@ class LPPDaemon:
         self.running = True
         self.reconnect_delay = RECONNECT_MIN_DELAY
         self.reconnect_task: asyncio.Task | None = None
-
-        # Current state - load from disk or use defaults
+        self._connect_task: asyncio.Task | None = None  # First connect from run()
+        self._reconnect_attempts = 0
+        self._reconnect_started_at = 0.0
+        self.giving_up = False  # Reconnect loop hit its cap
+        # BlueZ doesn't guarantee concurrent GATT writes are safe
+        self._write_lock = asyncio.Lock()
+        self._drop_task: asyncio.Task | None = None  # Disconnect of a stale client
+
+        # Current state - defaults until async_init() loads saved state
         self.fan_speed = 60
         self.pump_mode = 0  # High
-        self._load_state()
+        self.cached_mac: str | None = None  # Last device found by name
+        self._state_dirty = False
+        self._state_flush_task: asyncio.Task | None = None
+        self._state_lock = threading.Lock()  # Saves may run in worker threads
 
         # Socket server
         self.server: asyncio.Server | None = None
-        self.current_client: asyncio.StreamWriter | None = None
+        self.clients: set[asyncio.StreamWriter] = set()
+        self.subscribers: set[asyncio.StreamWriter] = set()
 
         # Keepalive task
         self.keepalive_task: asyncio.Task | None = None
+        self.last_user_activity = 0.0
+
+    async def async_init(self):
+        """Load saved state without blocking the event loop."""
+        await asyncio.to_thread(self._load_state)
 
     def _load_state(self):
         """Load saved state from disk."""
@@ -66,21 +124,43 @@ class LPPDaemon:
             if STATE_PATH.exists():
                 with open(STATE_PATH) as f:
                     state = json.load(f)
-                self.fan_speed = state.get('fan', 60)
-                self.pump_mode = state.get('pump', 0)
+                # Ignore values that don't map to a command frame
+                if state.get('fan') in range(len(FAN_CMDS)):
+                    self.fan_speed = state['fan']
+                if state.get('pump') in range(len(PUMP_CMDS)):
+                    self.pump_mode = state['pump']
+                self.cached_mac = state.get('mac')
                 log.info(f"Loaded state: fan={self.fan_speed}%, pump={self.pump_mode}")
         except Exception as e:
             log.warning(f"Failed to load state: {e}")
 
     def _save_state(self):
-        """Save current state to disk."""
+        """Save current state to disk atomically (write temp file, then rename)."""
         try:
-            STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-            with open(STATE_PATH, 'w') as f:
-                json.dump({'fan': self.fan_speed, 'pump': self.pump_mode}, f)
+            with self._state_lock:
+                STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                tmp = STATE_PATH.with_suffix('.json.tmp')
+                with open(tmp, 'w') as f:
+                    f.write(json.dumps({'fan': self.fan_speed, 'pump': self.pump_mode, 'mac': self.cached_mac}))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, STATE_PATH)
         except Exception as e:
             log.warning(f"Failed to save state: {e}")
 
+    def _mark_state_dirty(self):
+        """Schedule a state save, coalescing changes made in quick succession."""
+        self._state_dirty = True
+        if self._state_flush_task is None or self._state_flush_task.done():
+            self._state_flush_task = asyncio.create_task(self._flush_state_later())
+
+    async def _flush_state_later(self):
+        """Write the state file once changes settle, keeping fsync off the event loop."""
+        while self._state_dirty:
+            await asyncio.sleep(STATE_FLUSH_DELAY)
+            self._state_dirty = False
+            await asyncio.to_thread(self._save_state)
+
     def notification_handler(self, sender, data: bytearray):
         """Handle notifications from the device."""
         hex_str = ' '.join(f'{b:02x}' for b in data)
@@ -91,33 +171,63 @@ class LPPDaemon:
         if not self.connected or not self.client:
             return False
         try:
-            await self.client.write_gatt_char(NUS_TX_CHAR_UUID, data, response=False)
+            async with self._write_lock:
+                # The link may have dropped while we waited for the lock
+                if not self.connected or not self.client:
+                    return False
+                await asyncio.wait_for(
+                    self.client.write_gatt_char(NUS_TX_CHAR_UUID, data, response=False),
+                    timeout=BLE_WRITE_TIMEOUT
+                )
             return True
+        except asyncio.TimeoutError:
+            log.error(f"Send timed out after {BLE_WRITE_TIMEOUT:.0f}s")
         except Exception as e:
             log.error(f"Send error: {e}")
-            self.connected = False
-            self._schedule_reconnect()
-            return False
+        self.connected = False
+        self._drop_client()
+        self._broadcast_status()
+        self._schedule_reconnect()
+        return False
+
+    def _drop_client(self):
+        """Forget the current BLE client and disconnect it in the background."""
+        client, self.client = self.client, None
+        if not client:
+            return
+
+        async def disconnect():
+            try:
+                await asyncio.wait_for(client.disconnect(), timeout=BLE_WRITE_TIMEOUT)
+            except Exception:
+                pass
+
+        self._drop_task = asyncio.create_task(disconnect())
 
     async def send_fan_speed(self, speed: int, save: bool = True) -> bool:
         """Send fan speed command."""
-        cmd = bytes([0xfe, 0x1b, 0x01, speed, 0x00, 0x00, 0x00, 0xef])
-        if await self.send_command(cmd):
+        # Restores (save=False) must always reach a freshly connected device
+        if save and speed == self.fan_speed:
+            return True
+        if await self.send_command(FAN_CMDS[speed]):
             self.fan_speed = speed
             if save:
-                self._save_state()
+                self._mark_state_dirty()
+            self._broadcast_status()
             log.info(f"Fan set to {speed}%")
             return True
         return False
 
     async def send_pump_mode(self, mode: int, save: bool = True) -> bool:
         """Send pump mode command."""
-        cmd = bytes([0xfe, 0x1c, 0x01, 0x3c, mode, 0x00, 0x00, 0xef])
+        if save and mode == self.pump_mode:
+            return True
         labels = {0: "High", 1: "Max", 2: "Low", 3: "Medium"}
-        if await self.send_command(cmd):
+        if await self.send_command(PUMP_CMDS[mode]):
             self.pump_mode = mode
             if save:
-                self._save_state()
+                self._mark_state_dirty()
+            self._broadcast_status()
             log.info(f"Pump set to {labels.get(mode, mode)}")
             return True
         return False
@@ -125,46 +235,63 @@ class LPPDaemon:
     async def init_device(self):
         """Send initialization sequence."""
         log.info("Running device init sequence...")
-        init_cmds = [
-            bytes([0xfe, 0x1c, 0x01, 0x3c, 0x03, 0x00, 0x00, 0xef]),
-            bytes([0xfe, 0x1b, 0x01, 0x3c, 0x00, 0x00, 0x00, 0xef]),
-            bytes([0xfe, 0x1e, 0x01, 0x00, 0xb8, 0xff, 0x00, 0xef]),
-            bytes([0xfe, 0x33, 0x00, 0x00, 0x00, 0x00, 0x00, 0xef]),
-            b"sw",
-        ]
-        for cmd in init_cmds:
+        # Phase 1: config commands back to back, then "sw" and let the device settle
+        for cmd in INIT_CMDS[:-1]:
             await self.send_command(cmd)
-            await asyncio.sleep(0.1)
+            await asyncio.sleep(INIT_CMD_GAP)
+        await self.send_command(INIT_CMDS[-1])
         await asyncio.sleep(0.5)
-        for cmd in init_cmds[:-1]:
+        # Phase 2: replay the config commands
+        for cmd in INIT_CMDS[:-1]:
             await self.send_command(cmd)
-            await asyncio.sleep(0.1)
+            await asyncio.sleep(INIT_CMD_GAP)
         log.info("Device init complete")
 
+    async def _find_device(self) -> str | None:
+        """Scan for the LPP device and return its address."""
+        log.info("Scanning for LPP device...")
+        devices = await BleakScanner.discover(timeout=5.0)
+
+        for d in devices:
+            # Match by MAC address if specified
+            if DEVICE_ADDRESS and DEVICE_ADDRESS.lower() == d.address.lower():
+                return d.address
+            # Otherwise match by device name
+            if d.name and DEVICE_NAME.lower() in d.name.lower():
+                # Remember it so later connects can skip the scan
+                if d.address != self.cached_mac:
+                    self.cached_mac = d.address
+                    self._mark_state_dirty()
+                return d.address
+
+        return None
+
+    async def _connect_cached(self) -> bool:
+        """Try connecting directly to the cached device address."""
+        log.info(f"Connecting to cached device {self.cached_mac}...")
+        # Set before connecting so shutdown can disconnect a cancelled attempt
+        self.client = BleakClient(self.cached_mac, disconnected_callback=self._on_disconnect)
+        try:
+            await self.client.connect()
+        except (BleakError, asyncio.TimeoutError) as e:
+            log.warning(f"Cached device unavailable, falling back to scan: {e}")
+            self.client = None
+            return False
+        return True
+
     async def connect_ble(self) -> bool:
         """Connect to the LPP device."""
         try:
-            log.info("Scanning for LPP device...")
-            devices = await BleakScanner.discover(timeout=5.0)
-            address = None
-
-            for d in devices:
-                # Match by MAC address if specified
-                if DEVICE_ADDRESS and DEVICE_ADDRESS.lower() == d.address.lower():
-                    address = d.address
-                    break
-                # Otherwise match by device name
-                if d.name and DEVICE_NAME.lower() in d.name.lower():
-                    address = d.address
-                    break
+            # Skip the scan when we already know where the device is
+            if DEVICE_ADDRESS or not self.cached_mac or not await self._connect_cached():
+                address = await self._find_device()
+                if not address:
+                    log.warning("Device not found")
+                    return False
 
-            if not address:
-                log.warning("Device not found")
-                return False
-
-            log.info(f"Connecting to {address}...")
-            self.client = BleakClient(address, disconnected_callback=self._on_disconnect)
-            await self.client.connect()
+                log.info(f"Connecting to {address}...")
+                self.client = BleakClient(address, disconnected_callback=self._on_disconnect)
+                await self.client.connect()
 
             await self.client.start_notify(NUS_RX_CHAR_UUID, self.notification_handler)
 
@@ -175,41 +302,57 @@ class LPPDaemon:
             await self.init_device()
 
             # Apply current fan/pump settings (don't re-save, just restoring)
+            # Different opcodes, so no gap is needed; _write_lock keeps them in order
             await asyncio.sleep(0.3)
-            await self.send_fan_speed(self.fan_speed, save=False)
-            await asyncio.sleep(0.1)
-            await self.send_pump_mode(self.pump_mode, save=False)
+            await asyncio.gather(
+                self.send_fan_speed(self.fan_speed, save=False),
+                self.send_pump_mode(self.pump_mode, save=False)
+            )
 
             # Start keepalive to maintain connection
             self._start_keepalive()
 
+            # A write may have failed during init/restore; the reconnect it
+            # scheduled can't start while we're still running, so report it
+            if not self.connected:
+                log.warning("Device dropped during init")
+                return False
+
             log.info("Connected to LPP device")
+            self._broadcast_status()
             return True
 
         except Exception as e:
             log.error(f"Connection failed: {e}")
             self.connected = False
+            self._drop_client()
             return False
 
     def _on_disconnect(self, client):
         """Handle unexpected disconnection."""
+        if client is not self.client:
+            return  # A client we already dropped or replaced
         log.warning("Device disconnected")
         self.connected = False
+        self._broadcast_status()
         self._stop_keepalive()
         self._schedule_reconnect()
 
     def _start_keepalive(self):
         """Start periodic keepalive to maintain device connection."""
+        if not self.running:
+            return
         if self.keepalive_task and not self.keepalive_task.done():
             return
 
         async def keepalive_loop():
             while self.running and self.connected:
-                await asyncio.sleep(30)  # Every 30 seconds
-                if self.connected:
+                await asyncio.sleep(KEEPALIVE_INTERVAL)
+                idle = time.monotonic() - self.last_user_activity
+                if self.connected and (self.clients or idle < KEEPALIVE_IDLE_TIMEOUT):
                     # Send sync command to keep connection active
                     log.debug("Sending keepalive")
-                    await self.send_command(bytes([0xfe, 0x33, 0x00, 0x00, 0x00, 0x00, 0x00, 0xef]))
+                    await self.send_command(SYNC_CMD)
 
         self.keepalive_task = asyncio.create_task(keepalive_loop())
 
@@ -220,16 +363,32 @@ class LPPDaemon:
             self.keepalive_task = None
 
     def _schedule_reconnect(self):
-        """Schedule a reconnection attempt with exponential backoff."""
+        """Schedule a reconnection attempt with jittered exponential backoff."""
         if not self.running:
             return
         if self.reconnect_task and not self.reconnect_task.done():
             return  # Already scheduled
 
+        self._reconnect_attempts = 0
+        self._reconnect_started_at = time.monotonic()
+        self.reconnect_delay = RECONNECT_MIN_DELAY
+        if self.giving_up:
+            self.giving_up = False
+            self._broadcast_status()
+
         async def reconnect():
             while self.running and not self.connected:
-                log.info(f"Reconnecting in {self.reconnect_delay:.0f}s...")
-                await asyncio.sleep(self.reconnect_delay)
+                self._reconnect_attempts += 1
+                elapsed = time.monotonic() - self._reconnect_started_at
+                if self._reconnect_attempts > RECONNECT_MAX_ATTEMPTS or elapsed > RECONNECT_MAX_ELAPSED:
+                    log.warning("Giving up on reconnecting; send 'reconnect' to retry")
+                    self.giving_up = True
+                    self._broadcast_status()
+                    break
+                # Full jitter so attempts don't lock step with the device's advertising
+                sleep_for = random.uniform(RECONNECT_MIN_DELAY, self.reconnect_delay)
+                log.info(f"Reconnecting in {sleep_for:.1f}s...")
+                await asyncio.sleep(sleep_for)
                 if await self.connect_ble():
                     break
                 # Exponential backoff
@@ -237,31 +396,100 @@ class LPPDaemon:
 
         self.reconnect_task = asyncio.create_task(reconnect())
 
+    def _status(self) -> dict:
+        """Current device state as reported to clients."""
+        return {
+            "connected": self.connected,
+            "giving_up": self.giving_up,
+            "fan": self.fan_speed,
+            "pump": self.pump_mode
+        }
+
+    def _broadcast_status(self):
+        """Push the current state to all subscribed clients."""
+        msg = dumps({"event": "status", "ok": True, **self._status()}) + b'\n'
+        for writer in list(self.subscribers):
+            # Don't let a client that stopped reading grow our buffers
+            if writer.is_closing() or writer.transport.get_write_buffer_size() > SUBSCRIBER_MAX_BUFFER:
+                self.subscribers.discard(writer)
+                writer.close()
+                continue
+            writer.write(msg)
+
+    @staticmethod
+    def _peer_creds(writer: asyncio.StreamWriter) -> tuple[int, int, int] | None:
+        """Return (pid, uid, gid) of the process on the other end of the socket."""
+        sock = writer.get_extra_info('socket')
+        try:
+            creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+        except (AttributeError, OSError):
+            return None
+        return struct.unpack('3i', creds)
+
+    @staticmethod
+    async def _skip_line(reader: asyncio.StreamReader):
+        """Discard input up to and including the next newline."""
+        while True:
+            try:
+                await reader.readuntil(b'\n')
+                return
+            except asyncio.LimitOverrunError as e:
+                # Drop what's buffered without holding it, then keep looking
+                await reader.readexactly(e.consumed)
+
     async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         """Handle a client connection."""
-        peer = writer.get_extra_info('peername')
+        creds = self._peer_creds(writer)
+        if creds is None or creds[1] != os.getuid():
+            # Socket mode should already prevent this; don't rely on it alone
+            log.warning(f"Rejected client with credentials {creds}")
+            writer.close()
+            return
+
+        peer = f"pid {creds[0]}"
         log.info(f"Client connected: {peer}")
-        self.current_client = writer
+        self.clients.add(writer)
 
         try:
             while self.running:
-                data = await reader.readline()
-                if not data:
-                    break
+                try:
+                    data = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as e:
+                    # EOF; still answer a final request sent without a newline
+                    if not e.partial:
+                        break
+                    data = e.partial
+                except asyncio.LimitOverrunError:
+                    # Reject oversized frames without parsing them
+                    await self._skip_line(reader)
+                    writer.write(dumps({"ok": False, "error": "Request too large"}) + b'\n')
+                    await writer.drain()
+                    continue
 
                 try:
-                    request = json.loads(data.decode())
-                    response = await self.process_request(request)
-                except json.JSONDecodeError:
+                    request = loads(data)
+                except (ValueError, RecursionError):
+                    # ValueError covers JSONDecodeError and, with stdlib json,
+                    # undecodable bytes; deep nesting raises RecursionError
                     response = {"ok": False, "error": "Invalid JSON"}
-
-                writer.write((json.dumps(response) + '\n').encode())
+                else:
+                    if not isinstance(request, dict):
+                        response = {"ok": False, "error": "Invalid request"}
+                    elif request.get('cmd') == 'subscribe':
+                        # Status events are pushed on this connection from now on
+                        self.subscribers.add(writer)
+                        response = {"ok": True, **self._status()}
+                    else:
+                        response = await self.process_request(request)
+
+                writer.write(dumps(response) + b'\n')
                 await writer.drain()
-        except ConnectionResetError:
+        except (ConnectionResetError, asyncio.IncompleteReadError):
             pass
         finally:
             log.info(f"Client disconnected: {peer}")
-            self.current_client = None
+            self.clients.discard(writer)
+            self.subscribers.discard(writer)
             writer.close()
             await writer.wait_closed()
 
@@ -270,12 +498,7 @@ class LPPDaemon:
         cmd = request.get('cmd', '')
 
         if cmd == 'status':
-            return {
-                "ok": True,
-                "connected": self.connected,
-                "fan": self.fan_speed,
-                "pump": self.pump_mode
-            }
+            return {"ok": True, **self._status()}
 
         elif cmd == 'fan':
             value = request.get('value')
@@ -283,13 +506,9 @@ class LPPDaemon:
                 return {"ok": False, "error": "Fan value must be 0-100"}
             if not self.connected:
                 return {"ok": False, "error": "Not connected to device"}
+            self.last_user_activity = time.monotonic()
             success = await self.send_fan_speed(value)
-            return {
-                "ok": success,
-                "connected": self.connected,
-                "fan": self.fan_speed,
-                "pump": self.pump_mode
-            }
+            return {"ok": success, **self._status()}
 
         elif cmd == 'pump':
             value = request.get('value')
@@ -297,17 +516,13 @@ class LPPDaemon:
                 return {"ok": False, "error": "Pump mode must be 0-3"}
             if not self.connected:
                 return {"ok": False, "error": "Not connected to device"}
+            self.last_user_activity = time.monotonic()
             success = await self.send_pump_mode(value)
-            return {
-                "ok": success,
-                "connected": self.connected,
-                "fan": self.fan_speed,
-                "pump": self.pump_mode
-            }
+            return {"ok": success, **self._status()}
 
         elif cmd == 'reconnect':
             if self.connected:
-                return {"ok": True, "connected": True, "fan": self.fan_speed, "pump": self.pump_mode}
+                return {"ok": True, **self._status()}
             self._schedule_reconnect()
             return {"ok": True, "connected": False, "message": "Reconnection scheduled"}
 
@@ -316,20 +531,30 @@ class LPPDaemon:
 
     async def run(self):
         """Main daemon loop."""
+        await self.async_init()
+
         # Remove stale socket
-        if SOCKET_PATH.exists():
-            SOCKET_PATH.unlink()
+        await asyncio.to_thread(SOCKET_PATH.unlink, missing_ok=True)
 
         # Start Unix socket server
         self.server = await asyncio.start_unix_server(
             self.handle_client,
-            path=str(SOCKET_PATH)
+            path=str(SOCKET_PATH),
+            # readuntil() allows the newline one byte past the limit
+            limit=MAX_REQUEST_SIZE - 1
         )
-        SOCKET_PATH.chmod(0o600)  # Owner only
+        await asyncio.to_thread(SOCKET_PATH.chmod, 0o600)  # Owner only
         log.info(f"Listening on {SOCKET_PATH}")
 
-        # Initial connection attempt
-        if not await self.connect_ble():
+        # Initial connection attempt, as a task so shutdown can cancel it
+        self._connect_task = asyncio.create_task(self.connect_ble())
+        await asyncio.wait([self._connect_task])
+
+        # Shutdown may have started while we were connecting
+        if not self.running:
+            return
+
+        if not self._connect_task.result():
             self._schedule_reconnect()
 
         # Run until shutdown
@@ -341,42 +566,65 @@ class LPPDaemon:
         log.info("Shutting down...")
         self.running = False
 
+        # Cancel background tasks and wait for them to unwind
+        tasks = [
+            t for t in (self._connect_task, self.keepalive_task, self.reconnect_task, self._state_flush_task)
+            if t
+        ]
         self._stop_keepalive()
-
-        if self.reconnect_task:
-            self.reconnect_task.cancel()
-
-        if self.current_client:
-            self.current_client.close()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._drop_task:
+            await self._drop_task  # Bounded by its own timeout
+
+        # Write out any change still waiting for its flush
+        if self._state_dirty:
+            await asyncio.to_thread(self._save_state)
+
+        # Subscribers are also in clients
+        for writer in self.clients:
+            writer.close()
 
         if self.server:
             self.server.close()
             await self.server.wait_closed()
 
-        if self.client and self.connected:
+        # Also covers a connect that was cancelled part-way through
+        if self.client:
             try:
-                await self.client.disconnect()
+                # Don't let a stuck BlueZ hang shutdown
+                await asyncio.wait_for(self.client.disconnect(), timeout=2.0)
             except Exception:
                 pass
 
-        if SOCKET_PATH.exists():
-            SOCKET_PATH.unlink()
+        await asyncio.to_thread(SOCKET_PATH.unlink, missing_ok=True)
 
         log.info("Shutdown complete")
 
 
 async def main():
     daemon = LPPDaemon()
+    shutdown_task: asyncio.Task | None = None
+
+    def request_shutdown():
+        nonlocal shutdown_task
+        if shutdown_task is None:
+            shutdown_task = asyncio.create_task(daemon.shutdown())
 
     loop = asyncio.get_event_loop()
     for sig in (signal.SIGTERM, signal.SIGINT):
-        loop.add_signal_handler(sig, lambda: asyncio.create_task(daemon.shutdown()))
+        loop.add_signal_handler(sig, request_shutdown)
 
     try:
         await daemon.run()
     except asyncio.CancelledError:
         pass
 
+    # Closing the server ends run() early; let shutdown finish before exiting
+    if shutdown_task:
+        await shutdown_task
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -16,26 +16,34 @@ from textual import on
 
 from lpp_client import LPPClient
 
+# Seconds to coalesce fan slider changes before sending to the daemon
+FAN_DEBOUNCE_DELAY = 0.15
+
+# Seconds between attempts to reach the daemon while it is offline
+DAEMON_RETRY_INTERVAL = 2.0
+
 
 class FanControl(Static):
     """Fan speed control widget with slider."""
 
-    fan_speed = reactive(60)
+    # No init watcher: compose() already starts the slider at the default
+    fan_speed = reactive(60, init=False)
 
     def compose(self) -> ComposeResult:
+        self.slider = Slider(min=0, max=100, value=60, step=5, id="fan-slider")
+        self.value_label = Label("60%", id="fan-value")
         yield Label("FAN SPEED", classes="control-label")
         yield Horizontal(
-            Slider(min=0, max=100, value=60, step=5, id="fan-slider"),
-            Label("60%", id="fan-value"),
+            self.slider,
+            self.value_label,
             classes="slider-row"
         )
 
     def watch_fan_speed(self, speed: int) -> None:
-        try:
-            self.query_one("#fan-slider", Slider).value = speed
-            self.query_one("#fan-value", Label).update(f"{speed}%")
-        except:
-            pass
+        # Moves made from code must not come back as user changes
+        with self.slider.prevent(Slider.Changed):
+            self.slider.value = speed
+        self.value_label.update(f"{speed}%")
 
 
 class PumpControl(Static):
@@ -44,21 +52,22 @@ class PumpControl(Static):
     pump_mode = reactive(0)
 
     def compose(self) -> ComposeResult:
+        self._buttons = {
+            2: Button("Low", id="pump-2", classes="mode-btn"),
+            3: Button("Medium", id="pump-3", classes="mode-btn"),
+            0: Button("High", id="pump-0", classes="mode-btn selected"),
+            1: Button("Max", id="pump-1", classes="mode-btn"),
+        }
         yield Label("PUMP MODE", classes="control-label")
         yield Horizontal(
-            Button("Low", id="pump-2", classes="mode-btn"),
-            Button("Medium", id="pump-3", classes="mode-btn"),
-            Button("High", id="pump-0", classes="mode-btn selected"),
-            Button("Max", id="pump-1", classes="mode-btn"),
+            *self._buttons.values(),
             classes="button-row"
         )
 
     def set_mode(self, mode: int) -> None:
         self.pump_mode = mode
-        for btn in self.query(".mode-btn"):
-            btn.remove_class("selected")
-        mode_map = {2: "pump-2", 3: "pump-3", 0: "pump-0", 1: "pump-1"}
-        self.query_one(f"#{mode_map[mode]}").add_class("selected")
+        for btn_mode, btn in self._buttons.items():
+            btn.set_class(btn_mode == mode, "selected")
 
 
 class StatusDisplay(Static):
@@ -66,19 +75,22 @@ class StatusDisplay(Static):
 
     daemon_connected = reactive(False)
     ble_connected = reactive(False)
+    ble_giving_up = reactive(False)
 
     def compose(self) -> ComposeResult:
+        self._dot = Static("●", id="status-dot")
+        self._label = Label("Disconnected", id="status-label")
         yield Horizontal(
-            Static("●", id="status-dot"),
-            Label("Disconnected", id="status-label"),
+            self._dot,
+            self._label,
             classes="status-row"
         )
 
-    def update_status(self, daemon: bool, ble: bool) -> None:
+    def update_status(self, daemon: bool, ble: bool, giving_up: bool = False) -> None:
         self.daemon_connected = daemon
         self.ble_connected = ble
-        dot = self.query_one("#status-dot", Static)
-        label = self.query_one("#status-label", Label)
+        self.ble_giving_up = giving_up
+        dot, label = self._dot, self._label
 
         if daemon and ble:
             dot.update("●")
@@ -91,7 +103,8 @@ class StatusDisplay(Static):
             dot.add_class("partial")
             dot.remove_class("connected")
             dot.remove_class("disconnected")
-            label.update("BLE Disconnected")
+            # Daemon stopped retrying on its own
+            label.update("BLE Unavailable — press R" if giving_up else "BLE Disconnected")
         else:
             dot.update("●")
             dot.add_class("disconnected")
@@ -278,17 +291,30 @@ class LPPControlApp(App):
     def __init__(self):
         super().__init__()
         self.client = LPPClient()
+        # Separate connection for status events pushed by the daemon
+        self.events = LPPClient()
+        self._events_task: asyncio.Task | None = None
         self.daemon_connected = False
         self.ble_connected = False
+        self.ble_giving_up = False
+
+        # Latest fan speed waiting to be sent, coalesced while dragging
+        self._pending_fan: int | None = None
+        self._fan_debounce_task: asyncio.Task | None = None
+        # Daemon fan value pushed while a user change was still being sent
+        self._pushed_fan: int | None = None
 
     def compose(self) -> ComposeResult:
+        self._status = StatusDisplay(id="status")
+        self._fan_control = FanControl(id="fan-control", classes="control-panel")
+        self._pump_control = PumpControl(id="pump-control", classes="control-panel")
         yield Header()
         yield Container(
             Static("LPP CONTROL PANEL", classes="title-box"),
-            StatusDisplay(id="status"),
+            self._status,
             Button("Reconnect BLE", id="reconnect-btn"),
-            FanControl(id="fan-control", classes="control-panel"),
-            PumpControl(id="pump-control", classes="control-panel"),
+            self._fan_control,
+            self._pump_control,
             id="main-container"
         )
         yield Footer()
@@ -296,46 +322,57 @@ class LPPControlApp(App):
     async def on_mount(self) -> None:
         """Connect to daemon on startup."""
         await self.connect_daemon()
-        # Start periodic status check
-        self.set_interval(2.0, self.check_status)
+        # Follow daemon status pushes instead of polling
+        self._events_task = asyncio.create_task(self.follow_daemon())
 
     async def connect_daemon(self) -> None:
         """Connect to the LPP daemon."""
-        self.daemon_connected = self.client.connect()
+        self.daemon_connected = await self.client.connect()
         if self.daemon_connected:
             await self.sync_state()
         self.update_status_display()
 
     async def sync_state(self) -> None:
         """Sync UI state from daemon."""
-        result = self.client.get_status()
+        result = await self.client.get_status()
         if result.get("ok"):
             self.ble_connected = result.get("connected", False)
-            fan = self.query_one("#fan-control", FanControl)
-            pump = self.query_one("#pump-control", PumpControl)
-            fan.fan_speed = result.get("fan", 60)
-            pump.set_mode(result.get("pump", 0))
+            self.ble_giving_up = result.get("giving_up", False)
+            self._fan_control.fan_speed = result.get("fan", 60)
+            self._pump_control.set_mode(result.get("pump", 0))
         else:
             self.daemon_connected = False
 
-    async def check_status(self) -> None:
-        """Periodic status check."""
-        if not self.daemon_connected:
-            await self.connect_daemon()
-            return
-
-        result = self.client.get_status()
-        if result.get("ok"):
-            self.ble_connected = result.get("connected", False)
+    async def follow_daemon(self) -> None:
+        """Apply status events from the daemon, reconnecting while it is offline."""
+        while True:
+            if not self.daemon_connected:
+                await self.connect_daemon()
+            if self.daemon_connected and await self.events.connect():
+                async for status in self.events.subscribe():
+                    self.apply_status(status)
+                # Event stream ended: the daemon went away
+                self.daemon_connected = False
+                self.client.disconnect()
+                self.update_status_display()
+            await asyncio.sleep(DAEMON_RETRY_INTERVAL)
+
+    def apply_status(self, status: dict) -> None:
+        """Update UI state from a daemon status event."""
+        self.ble_connected = status.get("connected", False)
+        self.ble_giving_up = status.get("giving_up", False)
+        # Don't yank the slider back while the user is still dragging it;
+        # the last pushed value is applied once the drag has been sent
+        if self._fan_debounce_task is None or self._fan_debounce_task.done():
+            self._fan_control.fan_speed = status.get("fan", 60)
         else:
-            self.daemon_connected = False
-            self.client.disconnect()
+            self._pushed_fan = status.get("fan", 60)
+        self._pump_control.set_mode(status.get("pump", 0))
         self.update_status_display()
 
     def update_status_display(self) -> None:
         """Update the status display widget."""
-        status = self.query_one("#status", StatusDisplay)
-        status.update_status(self.daemon_connected, self.ble_connected)
+        self._status.update_status(self.daemon_connected, self.ble_connected, self.ble_giving_up)
 
     # Event handlers
     @on(Button.Pressed, "#reconnect-btn")
@@ -343,7 +380,7 @@ class LPPControlApp(App):
         if not self.daemon_connected:
             await self.connect_daemon()
         else:
-            result = self.client.reconnect_ble()
+            result = await self.client.reconnect_ble()
             if result.get("ok"):
                 self.notify("Reconnection requested", severity="information")
             else:
@@ -351,14 +388,28 @@ class LPPControlApp(App):
 
     @on(Slider.Changed, "#fan-slider")
     async def on_fan_slider_changed(self, event: Slider.Changed) -> None:
-        fan = self.query_one("#fan-control", FanControl)
         speed = int(event.value)
-        fan.query_one("#fan-value", Label).update(f"{speed}%")
+        self._fan_control.fan_speed = speed
 
         if self.daemon_connected:
-            result = self.client.set_fan(speed)
+            self._pending_fan = speed
+            if self._fan_debounce_task is None or self._fan_debounce_task.done():
+                self._fan_debounce_task = asyncio.create_task(self._flush_fan())
+
+    async def _flush_fan(self) -> None:
+        """Send the latest pending fan speed, at most once per debounce interval."""
+        while self._pending_fan is not None:
+            await asyncio.sleep(FAN_DEBOUNCE_DELAY)
+            speed, self._pending_fan = self._pending_fan, None
+            if not self.daemon_connected:
+                break
+            result = await self.client.set_fan(speed)
             if not result.get("ok"):
                 self.notify(result.get("error", "Failed"), severity="error")
+        # Catch up with what the daemon reported while we were sending
+        if self._pushed_fan is not None:
+            self._fan_control.fan_speed = self._pushed_fan
+            self._pushed_fan = None
 
     @on(Button.Pressed, "#pump-0")
     async def on_pump_high(self) -> None:
@@ -377,10 +428,9 @@ class LPPControlApp(App):
         await self._set_pump(3)
 
     async def _set_pump(self, mode: int) -> None:
-        pump = self.query_one("#pump-control", PumpControl)
-        pump.set_mode(mode)
+        self._pump_control.set_mode(mode)
         if self.daemon_connected:
-            result = self.client.set_pump(mode)
+            result = await self.client.set_pump(mode)
             if result.get("ok"):
                 labels = {0: "High", 1: "Max", 2: "Low", 3: "Medium"}
                 self.notify(f"Pump: {labels.get(mode)}", severity="information")
@@ -392,14 +442,12 @@ class LPPControlApp(App):
         asyncio.create_task(self.on_reconnect_pressed())
 
     def action_fan_up(self) -> None:
-        fan = self.query_one("#fan-control", FanControl)
-        slider = fan.query_one("#fan-slider", Slider)
+        slider = self._fan_control.slider
         new_val = min(100, slider.value + 5)
         slider.value = new_val
 
     def action_fan_down(self) -> None:
-        fan = self.query_one("#fan-control", FanControl)
-        slider = fan.query_one("#fan-slider", Slider)
+        slider = self._fan_control.slider
         new_val = max(0, slider.value - 5)
         slider.value = new_val
 